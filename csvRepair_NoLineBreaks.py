@@ -5,10 +5,31 @@ CSV Zeilenumbruch-Ersetzer
 Ersetzt Zeilenumbrüche innerhalb von CSV-Feldern durch " <br> "
 """
 
+import codecs
 import csv
 import sys
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+
+from encoding_utils import detect_encoding, detect_delimiter, is_same_file
+
+# Puffergröße für das Lesen und Schreiben der CSV-Dateien (1 MB statt 8 KB Standard)
+IO_BUFFER_SIZE = 1 << 20
+
+# Ab dieser Zeilenanzahl verteilt process_csv_pandas die Spalten auf mehrere Prozesse
+PARALLEL_MIN_ROWS = 100000
+
+# Alle Arten von Zeilenumbrüchen: Windows (\r\n), Mac (\r), Unix/Linux (\n)
+_BR_RE = re.compile(r'\r\n|\r|\n')
+
+# Whitespace wie \s in Python, aber ausgeschrieben: RE2 (PyArrow-Strings in
+# process_csv_pandas) versteht unter \s nur ASCII-Whitespace, z.B. kein \xa0
+_WHITESPACE = '\t\n\x0b\x0c\r\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000'
+
+# Ein oder mehrere <br> am Feldende (mit optionalen Leerzeichen davor/danach)
+_TRAIL_BR_PATTERN = f'(?:[{_WHITESPACE}]*<br>[{_WHITESPACE}]*)+'
+_TRAIL_BR_RE = re.compile(_TRAIL_BR_PATTERN + r'\Z')
 
 def process_csv(input_file, output_file=None):
     """
@@ -25,18 +46,12 @@ def process_csv(input_file, output_file=None):
         output_file = f"{base_name}_processed{extension}"
     
     try:
+        if is_same_file(input_file, output_file):
+            print("Fehler: Eingabe- und Ausgabedatei dürfen nicht identisch sein.")
+            return False
+        
         # Erkenne die Kodierung der Datei (meist UTF-8 oder Latin-1 für deutsche Dateien)
-        encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-        file_encoding = None
-        
-        for encoding in encodings:
-            try:
-                with open(input_file, 'r', encoding=encoding) as test_file:
-                    test_file.read()
-                    file_encoding = encoding
-                    break
-            except UnicodeDecodeError:
-                continue
+        file_encoding = detect_encoding(input_file)
         
         if file_encoding is None:
             print(f"Fehler: Konnte die Kodierung der Datei nicht erkennen.")
@@ -44,89 +59,260 @@ def process_csv(input_file, output_file=None):
         
         print(f"Verwende Kodierung: {file_encoding}")
         
-        # Liste für die verarbeiteten Zeilen
-        processed_rows = []
+        # Erkenne den Delimiter (normalerweise ; oder ,)
+        delimiter = detect_delimiter(input_file)
+        print(f"Erkannter Delimiter: '{delimiter}'")
         
-        # Lese die CSV-Datei
-        with open(input_file, 'r', encoding=file_encoding, newline='') as infile:
-            # Erkenne den Delimiter (normalerweise ; oder ,)
-            sample = infile.read(1024)
-            infile.seek(0)
-            delimiter = ';' if ';' in sample else ','
-            
-            print(f"Erkannter Delimiter: '{delimiter}'")
-            
-            # CSV-Reader mit dem erkannten Delimiter
+        # Lese, bereinige und schreibe die CSV-Datei in einem Durchlauf (Zeile für Zeile)
+        with open(input_file, 'r', encoding=file_encoding, newline='', buffering=IO_BUFFER_SIZE) as infile, \
+             open(output_file, 'w', encoding=file_encoding, newline='', buffering=IO_BUFFER_SIZE) as outfile:
+            # CSV-Reader und -Writer mit dem erkannten Delimiter
             csv_reader = csv.reader(infile, delimiter=delimiter)
+            csv_writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
             
-            # Zähler für ersetzte Umbrüche
+            # Zähler für ersetzte Umbrüche, Strichpunkte und entfernte trailing <br>
             total_replacements = 0
+            semicolon_replacements = 0
+            br_removals = 0
+            rows_with_semicolons = []
             row_num = 0
             
             # Verarbeite jede Zeile
             for row_num, row in enumerate(csv_reader, 1):
-                # Ersetze Zeilenumbrüche in jedem Feld
-                processed_row = []
-                for field in row:
-                    # Ersetze alle Arten von Zeilenumbrüchen und zähle sie
-                    # Windows (\r\n)
-                    count_rn = field.count('\r\n')
-                    processed_field = field.replace('\r\n', ' <br> ')
-                    
-                    # Unix/Linux (\n)
-                    count_n = processed_field.count('\n')
-                    processed_field = processed_field.replace('\n', ' <br> ')
-                    
-                    # Mac (\r)
-                    count_r = processed_field.count('\r')
-                    processed_field = processed_field.replace('\r', ' <br> ')
+                # Ersetze alle Arten von Zeilenumbrüchen in einem Durchlauf und zähle sie
+                # (die meisten Felder enthalten keine - dann reicht die schnelle in-Prüfung)
+                substitutions = [_BR_RE.subn(' <br> ', field) if '\n' in field or '\r' in field else (field, 0)
+                                 for field in row]
+                processed_row = [field for field, _ in substitutions]
+                total_replacements += sum(n for _, n in substitutions)
+                
+                for col_num, field in enumerate(processed_row):
+                    # Prüfe ob das Feld Strichpunkte enthält (diese würden in CSV gequotet werden)
+                    count = field.count(';')
+                    if count:
+                        semicolon_replacements += count
+                        rows_with_semicolons.append((row_num, col_num + 1, field[:50] + "..." if len(field) > 50 else field))
+                        field = field.replace(';', ':')
+                        processed_row[col_num] = field
                     
-                    total_replacements += count_rn + count_n + count_r
-                    processed_row.append(processed_field)
+                    # Entferne trailing <br> (mit optionalen Leerzeichen davor/danach)
+                    m = _TRAIL_BR_RE.search(field) if '<br>' in field else None
+                    if m:
+                        br_removals += field.count('<br>', m.start())
+                        processed_row[col_num] = field[:m.start()]
                 
-                processed_rows.append(processed_row)
+                csv_writer.writerow(processed_row)
             
             print(f"Verarbeitet: {row_num} Zeilen")
             print(f"Ersetzte Zeilenumbrüche: {total_replacements}")
         
-        # Zusätzlicher Schritt: Strichpunkte in quoted Feldern ersetzen und trailing <br> entfernen
+        if rows_with_semicolons:
+            print(f"\nZeilen mit Strichpunkten in Spalten (ersetzt durch Doppelpunkt):")
+            for row_n, col_n, preview in rows_with_semicolons:
+                print(f"  Zeile {row_n}, Spalte {col_n}: {preview}")
+        
+        print(f"\nErsetzte Strichpunkte in Spalten: {semicolon_replacements}")
+        print(f"Entfernte trailing <br>: {br_removals}")
+        
+        print(f"Erfolgreich gespeichert als: {output_file}")
+        return True
+        
+    except FileNotFoundError:
+        print(f"Fehler: Die Datei '{input_file}' wurde nicht gefunden.")
+        return False
+    except Exception as e:
+        print(f"Ein Fehler ist aufgetreten: {e}")
+        return False
+
+
+def read_table(input_file, file_encoding, delimiter):
+    """
+    Liest die CSV-Datei vollständig als DataFrame aus unveränderten Strings
+    
+    Bevorzugt wird der mehrkernige CSV-Reader von PyArrow; das Ergebnis enthält dann
+    Arrow-Strings, sodass Series.str-Operationen als Arrow-Compute-Kernel laufen.
+    Ohne pyarrow wird der C-Parser von pandas verwendet. (pandas' engine='pyarrow'
+    eignet sich nicht, da es trotz dtype=str Typen erkennt, z.B. "005" -> "5".)
+    
+    Returns:
+        DataFrame mit Spalten 0..n-1, Kopfzeile als erste Zeile
+    
+    Raises:
+        pandas.errors.ParserError: bei uneinheitlicher Spaltenanzahl oder Leerzeilen
+        pandas.errors.EmptyDataError: wenn nach einem BOM keine Daten folgen (nur ohne pyarrow)
+    """
+    import pandas as pd
+    
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+    except ImportError:
+        pa = None
+    
+    if pa is not None:
+        # Spaltenanzahl aus der ersten Zeile, damit alle Spalten explizit als String gelesen werden
+        with open(input_file, 'r', encoding=file_encoding, newline='') as infile:
+            first_row = next(csv.reader(infile, delimiter=delimiter), [])
+        if not first_row:
+            # Ohne Spaltennamen würde PyArrow die erste Zeile als Kopfzeile verbrauchen
+            raise pd.errors.ParserError("Leerzeile am Dateianfang")
+        column_names = [str(i) for i in range(len(first_row))]
+        
+        try:
+            table = pacsv.read_csv(
+                input_file,
+                read_options=pacsv.ReadOptions(column_names=column_names, encoding=file_encoding),
+                parse_options=pacsv.ParseOptions(delimiter=delimiter, newlines_in_values=True,
+                                                 ignore_empty_lines=False),
+                convert_options=pacsv.ConvertOptions(
+                    column_types={name: pa.string() for name in column_names},
+                    strings_can_be_null=False))
+        except pa.ArrowInvalid as e:
+            # Einheitlich wie pandas melden (z.B. uneinheitliche Spaltenanzahl)
+            raise pd.errors.ParserError(str(e)) from e
+        
+        df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+        
+        # Leerzeilen liefert PyArrow als Zeilen aus leeren Feldern; csv.writer schreibt sie
+        # aber als leere Zeile - solche Dateien der Standardverarbeitung überlassen
+        if len(df.columns) and (df == '').all(axis=1).any():
+            raise pd.errors.ParserError("Leerzeilen")
+    else:
+        # Der C-Parser füllt zu kurze Zeilen stillschweigend auf und macht aus Leerzeilen
+        # Zeilen mit leeren Feldern - beides vorher erkennen (Leerzeile = 0 Felder)
+        with open(input_file, 'r', encoding=file_encoding, newline='', buffering=IO_BUFFER_SIZE) as infile:
+            csv_reader = csv.reader(infile, delimiter=delimiter)
+            column_count = len(next(csv_reader, []))
+            if column_count == 0 or any(len(row) != column_count for row in csv_reader):
+                raise pd.errors.ParserError("Uneinheitliche Spaltenanzahl oder Leerzeilen")
+        
+        df = pd.read_csv(input_file, sep=delimiter, header=None, dtype=str, skip_blank_lines=False,
+                         keep_default_na=False, na_filter=False, encoding=file_encoding)
+    
+    # Beide Parser entfernen ein UTF-8-BOM - für identische Ausgabe wieder voranstellen
+    if file_encoding == 'utf-8' and len(df):
+        with open(input_file, 'rb') as f:
+            if f.read(3) == codecs.BOM_UTF8:
+                df.iat[0, 0] = '\ufeff' + df.iat[0, 0]
+    
+    return df
+
+def clean_column(column):
+    """
+    Wendet alle Ersetzungen auf eine ganze Spalte an (für process_csv_pandas)
+    
+    Die Muster verwenden $ statt \\Z, da pandas sie ggf. an PyArrow/RE2 weitergibt.
+    
+    Returns:
+        tuple: (bereinigte Spalte, ersetzte Zeilenumbrüche, ersetzte Strichpunkte,
+                Liste von (Zeilenindex, Vorschau) der Felder mit Strichpunkten, entfernte trailing <br>)
+    """
+    # Ersetze alle Arten von Zeilenumbrüchen und zähle sie
+    replacements = int(column.str.count(_BR_RE.pattern).sum())
+    column = column.str.replace(_BR_RE.pattern, ' <br> ', regex=True)
+    
+    # Ersetze Strichpunkte durch Doppelpunkte
+    semicolons = 0
+    semicolon_fields = []
+    has_semicolon = column.str.contains(';', regex=False)
+    if has_semicolon.any():
+        semicolons = int(column[has_semicolon].str.count(';').sum())
+        for row_idx, field in column[has_semicolon].items():
+            semicolon_fields.append((row_idx, field[:50] + "..." if len(field) > 50 else field))
+        column = column.str.replace(';', ':', regex=False)
+    
+    # Entferne trailing <br> (mit optionalen Leerzeichen davor/danach)
+    trailing = column.str.extract(f'({_TRAIL_BR_PATTERN})$', expand=False)
+    br_removals = int(trailing.str.count('<br>').sum())
+    column = column.str.replace(_TRAIL_BR_PATTERN + '$', '', regex=True)
+    
+    return column, replacements, semicolons, semicolon_fields, br_removals
+
+def process_csv_pandas(input_file, output_file=None):
+    """
+    Vektorisierte Variante von process_csv (benötigt pandas, optional pyarrow)
+    
+    Die Ersetzungen werden spaltenweise über Series.str ausgeführt statt Feld für Feld.
+    Das ist nicht automatisch schneller als process_csv (siehe README).
+    Setzt eine einheitliche Spaltenanzahl ohne Leerzeilen voraus; andernfalls oder ohne pandas
+    wird auf process_csv zurückgegriffen.
+    
+    Args:
+        input_file: Pfad zur Eingabe-CSV-Datei
+        output_file: Pfad zur Ausgabe-CSV-Datei (optional, Standard: input_file_processed.csv)
+    """
+    try:
+        import pandas as pd
+    except ImportError:
+        print("Hinweis: pandas ist nicht installiert, verwende Standardverarbeitung.")
+        return process_csv(input_file, output_file)
+    
+    # Wenn keine Ausgabedatei angegeben, erstelle einen Namen basierend auf der Eingabedatei
+    if output_file is None:
+        base_name, extension = os.path.splitext(input_file)
+        output_file = f"{base_name}_processed{extension}"
+    
+    try:
+        # Erkenne die Kodierung der Datei (meist UTF-8 oder Latin-1 für deutsche Dateien)
+        file_encoding = detect_encoding(input_file)
+        
+        if file_encoding is None:
+            print(f"Fehler: Konnte die Kodierung der Datei nicht erkennen.")
+            return False
+        
+        print(f"Verwende Kodierung: {file_encoding}")
+        
+        # Erkenne den Delimiter (normalerweise ; oder ,)
+        delimiter = detect_delimiter(input_file)
+        print(f"Erkannter Delimiter: '{delimiter}'")
+        
+        # Lese alle Zeilen (auch die Kopfzeile) als unveränderte Strings
+        try:
+            df = read_table(input_file, file_encoding, delimiter)
+        except (pd.errors.ParserError, pd.errors.EmptyDataError):
+            print("Hinweis: Uneinheitliche Spaltenanzahl, Leerzeilen oder leere Datei, verwende Standardverarbeitung.")
+            return process_csv(input_file, output_file)
+        
+        # Zähler für ersetzte Umbrüche, Strichpunkte und entfernte trailing <br>
+        total_replacements = 0
         semicolon_replacements = 0
         br_removals = 0
         rows_with_semicolons = []
         
-        for row_num, row in enumerate(processed_rows, 1):
-            for col_num, field in enumerate(row):
-                original_field = field
-                
-                # Prüfe ob das Feld Strichpunkte enthält (diese würden in CSV gequotet werden)
-                if ';' in field:
-                    count = field.count(';')
-                    semicolon_replacements += count
-                    rows_with_semicolons.append((row_num, col_num + 1, field[:50] + "..." if len(field) > 50 else field))
-                    row[col_num] = field.replace(';', ':')
-                    field = row[col_num]
-                
-                # Entferne trailing <br> (mit optionalen Leerzeichen davor/danach)
-                while True:
-                    new_field = re.sub(r'\s*<br>\s*$', '', field)
-                    if new_field == field:
-                        break
-                    br_removals += 1
-                    field = new_field
-                row[col_num] = field
+        # Verarbeite jede Spalte als Ganzes - bei großen Dateien parallel in mehreren
+        # Prozessen (die Spalten sind unabhängig voneinander). Mit nur einem Worker
+        # wäre der Pool reiner Mehraufwand für das Pickling der Spalten.
+        columns = [df[col] for col in df.columns]
+        max_workers = min(len(columns), os.cpu_count() or 1)
+        if len(df) >= PARALLEL_MIN_ROWS and max_workers > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(executor.map(clean_column, columns))
+        else:
+            results = [clean_column(column) for column in columns]
+        
+        for col_num, (col, result) in enumerate(zip(df.columns, results)):
+            column, replacements, semicolons, semicolon_fields, removals = result
+            df[col] = column
+            total_replacements += replacements
+            semicolon_replacements += semicolons
+            br_removals += removals
+            for row_idx, preview in semicolon_fields:
+                rows_with_semicolons.append((row_idx + 1, col_num + 1, preview))
+        
+        print(f"Verarbeitet: {len(df)} Zeilen")
+        print(f"Ersetzte Zeilenumbrüche: {total_replacements}")
         
         if rows_with_semicolons:
             print(f"\nZeilen mit Strichpunkten in Spalten (ersetzt durch Doppelpunkt):")
-            for row_n, col_n, preview in rows_with_semicolons:
+            for row_n, col_n, preview in sorted(rows_with_semicolons):
                 print(f"  Zeile {row_n}, Spalte {col_n}: {preview}")
         
         print(f"\nErsetzte Strichpunkte in Spalten: {semicolon_replacements}")
         print(f"Entfernte trailing <br>: {br_removals}")
         
-        # Schreibe die verarbeitete CSV-Datei
-        with open(output_file, 'w', encoding=file_encoding, newline='') as outfile:
-            csv_writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerows(processed_rows)
+        # Schreibe die verarbeitete CSV-Datei (gleiches Format wie csv.writer)
+        df.to_csv(output_file, sep=delimiter, header=False, index=False,
+                  encoding=file_encoding, quoting=csv.QUOTE_MINIMAL, lineterminator='\r\n')
         
         print(f"Erfolgreich gespeichert als: {output_file}")
         return True
@@ -145,8 +331,13 @@ def main():
     print("CSV Zeilenumbruch-Ersetzer")
     print("-" * 40)
     
-    # Prüfe Kommandozeilenargumente
-    if len(sys.argv) < 2:
+    # Prüfe Kommandozeilenargumente (--pandas aktiviert die spaltenweise pandas-Verarbeitung)
+    args = sys.argv[1:]
+    use_pandas = '--pandas' in args
+    if use_pandas:
+        args.remove('--pandas')
+    
+    if not args:
         # Interaktiver Modus
         input_file = input("Bitte geben Sie den Pfad zur CSV-Datei ein: ").strip().strip('"\'')
         if not input_file:
@@ -157,11 +348,12 @@ def main():
         output_file = output_file if output_file else None
     else:
         # Kommandozeilenargumente verwenden
-        input_file = sys.argv[1]
-        output_file = sys.argv[2] if len(sys.argv) > 2 else None
+        input_file = args[0]
+        output_file = args[1] if len(args) > 1 else None
     
     # Verarbeite die Datei
-    if process_csv(input_file, output_file):
+    process = process_csv_pandas if use_pandas else process_csv
+    if process(input_file, output_file):
         print("\nVerarbeitung erfolgreich abgeschlossen!")
     else:
         print("\nVerarbeitung fehlgeschlagen.")
@@ -1,20 +1,24 @@
 import csv
+import io
+
+from encoding_utils import encoding_from_file, delimiter_from_sample
 
 input_file = r"x:\DEVELOPMENTS\Python_CSVRepair_LineBreaks\jh_processed.csv"
-encoding = 'utf-8'
 
-with open(input_file, 'r', encoding=encoding, newline='') as infile:
-    sample = infile.read(1024)
-    infile.seek(0)
-    delimiter = ';' if ';' in sample else ','
-    
-    csv_reader = csv.reader(infile, delimiter=delimiter)
-    rows = list(csv_reader)
-    header = rows[0]
-    
-    print(f"First column raw: {repr(header[0])}")
-    print(f"First column stripped: {repr(header[0].strip())}")
-    
-    expected = "DokumentUrl*"
-    print(f"Expected: {repr(expected)}")
-    print(f"Match? {header[0].strip() == expected}")
+# Nur die Kopfzeile lesen - Kodierung und Delimiter werden allein aus ihr bestimmt,
+# statt die ganze Datei zu prüfen
+with open(input_file, 'rb') as raw_infile:
+    header_line = raw_infile.readline()
+
+# Standard-Kandidaten ohne utf-8-sig, damit ein BOM in der ersten Spalte sichtbar bleibt
+encoding = encoding_from_file(io.BytesIO(header_line))
+delimiter = delimiter_from_sample(header_line, (';', ','))
+
+header = next(csv.reader([header_line.decode(encoding)], delimiter=delimiter))
+
+print(f"First column raw: {repr(header[0])}")
+print(f"First column stripped: {repr(header[0].strip())}")
+
+expected = "DokumentUrl*"
+print(f"Expected: {repr(expected)}")
+print(f"Match? {header[0].strip() == expected}")
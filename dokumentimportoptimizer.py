@@ -9,14 +9,24 @@ Prüft und optimiert CSV-Dateien für den Import:
 - Splittet große Dateien (>950KB) in kleinere Chunks
 """
 
+import codecs
 import csv
+import io
+import itertools
 import sys
 import os
+import re
 from collections import OrderedDict
 
+from encoding_utils import SAMPLE_SIZE, encoding_from_file, delimiter_from_sample, is_same_file
+
 # Konstanten
 MAX_FILE_SIZE_KB = 950
 ROWS_PER_CHUNK = 3800
+IO_BUFFER_SIZE = 1 << 20  # Puffergröße für Lesen/Schreiben (1 MB statt 8 KB Standard)
+
+# Enthält ein Feld "http" (Groß-/Kleinschreibung egal), ist die Zeile keine Kopfzeile
+_HTTP_RE = re.compile('http', re.IGNORECASE)
 
 # Definiere die erwarteten Spalten in der richtigen Reihenfolge
 # Mit verschiedenen Sprachversionen
@@ -35,6 +45,19 @@ EXPECTED_COLUMNS = [
     ["Löschen", "Delete", "Supprimer"]
 ]
 
+# Standard-Spaltennamen (erste Option aus jeder Liste)
+STANDARD_COLUMNS = [col_variations[0] for col_variations in EXPECTED_COLUMNS]
+
+# Position jeder Standard-Spalte in der Ausgabe
+STANDARD_COLUMN_INDEX = {standard_col: i for i, standard_col in enumerate(STANDARD_COLUMNS)}
+
+# Flaches Lookup: jede Sprachversion -> Standard-Spaltenname
+VARIANT_TO_STANDARD = {
+    variation: col_variations[0]
+    for col_variations in EXPECTED_COLUMNS
+    for variation in col_variations
+}
+
 def get_column_mapping(header_row):
     """
     Erstellt ein Mapping zwischen den gefundenen Spalten und den erwarteten Spalten
@@ -45,34 +68,71 @@ def get_column_mapping(header_row):
         list: Liste der fehlenden Spalten
     """
     column_mapping = {}
-    standard_columns = []
-    found_columns = set()
-    
-    # Erstelle Standard-Spaltennamen (erste Option aus jeder Liste)
-    for col_variations in EXPECTED_COLUMNS:
-        standard_columns.append(col_variations[0])
     
     # Finde Übereinstimmungen zwischen Header und erwarteten Spalten
     for header_col in header_row:
         # Entferne Whitespace und BOM (Byte Order Mark) falls vorhanden
-        header_col_clean = header_col.strip().lstrip('\ufeff')
-        
-        for col_variations in EXPECTED_COLUMNS:
-            if header_col_clean in col_variations:
-                standard_col = col_variations[0]
-                column_mapping[header_col] = standard_col
-                found_columns.add(standard_col)
-                break
+        standard_col = VARIANT_TO_STANDARD.get(header_col.strip().lstrip('\ufeff'))
+        if standard_col is not None:
+            column_mapping[header_col] = standard_col
     
     # Identifiziere fehlende Spalten
-    missing_columns = []
-    for standard_col in standard_columns:
-        if standard_col not in found_columns:
-            missing_columns.append(standard_col)
+    found_columns = set(column_mapping.values())
+    missing_columns = [col for col in STANDARD_COLUMNS if col not in found_columns]
     
-    return column_mapping, standard_columns, missing_columns
+    return column_mapping, list(STANDARD_COLUMNS), missing_columns
 
-def process_csv(input_file, output_file=None):
+def build_row_function(src_indices):
+    """
+    Erzeugt eine spezialisierte Funktion, die eine Datenzeile in die Standard-Spaltenreihenfolge bringt
+    
+    Die Index-Permutation ist für alle Zeilen gleich und wird deshalb einmal als
+    Listen-Literal kompiliert, z.B. [(row[7] if n > 7 else row[3] if n > 3 else ''), '', ...],
+    statt für jede Zeile über src_indices zu iterieren.
+    
+    Kommt eine Standard-Spalte mehrfach vor, gewinnt der letzte in der Zeile vorhandene
+    Wert - ist die Zeile kürzer als der Header, also ein früheres Vorkommen.
+    
+    Args:
+        src_indices: Für jede Ausgabespalte die aufsteigenden Indizes in der Originalzeile (leer = leer)
+    
+    Returns:
+        function: build_row(row) -> list
+    """
+    cells = ", ".join(
+        "(" + "".join(f"row[{int(j)}] if n > {int(j)} else " for j in reversed(indices)) + "'')"
+        for indices in src_indices
+    )
+    code = f"def build_row(row):\n    n = len(row)\n    return [{cells}]\n"
+    
+    # Der Code enthält nur Ganzzahlen aus dem Header-Mapping, keine Inhalte der CSV-Datei
+    namespace = {}
+    exec(code, namespace)
+    return namespace['build_row']
+
+class CountingWriter:
+    """
+    Schreibziel für csv.writer, das die geschriebenen Bytes selbst mitzählt
+    
+    csv.writer übergibt jede Zeile als einen String. Dieser wird hier kodiert und in
+    die (binär und gepuffert geöffnete) Datei geschrieben. So sind die Byte-Positionen
+    der Zeilengrenzen bekannt, ohne tell() aufzurufen - tell() auf einer Textdatei
+    leert bei jedem Aufruf den Puffer.
+    """
+    
+    def __init__(self, raw_file, encoding):
+        self.raw_file = raw_file
+        # Inkrementeller Encoder: utf-8-sig schreibt das BOM nur vor der ersten Zeile
+        self.encode = codecs.getincrementalencoder(encoding)().encode
+        self.bytes_written = 0
+    
+    def write(self, text):
+        data = self.encode(text)
+        self.raw_file.write(data)
+        self.bytes_written += len(data)
+        return len(text)
+
+def process_csv(input_file, output_file=None, verbose=True):
     """
     Verarbeitet die CSV-Datei:
     - Prüft Spaltenstruktur
@@ -82,63 +142,68 @@ def process_csv(input_file, output_file=None):
     Args:
         input_file: Pfad zur Eingabe-CSV-Datei
         output_file: Pfad zur Ausgabe-CSV-Datei (optional)
+        verbose: Statusmeldungen ausgeben (Fehler und Rückfragen erscheinen immer)
     """
     
+    def log(msg):
+        """Gibt Statusmeldungen nur im verbose-Modus aus"""
+        if verbose:
+            print(msg)
+    
     # Generiere Ausgabedateinamen wenn nicht angegeben
     if output_file is None:
         base_name, extension = os.path.splitext(input_file)
         output_file = f"{base_name}_optimized{extension}"
     
     try:
-        # Erkenne die Kodierung
-        # utf-8-sig zuerst prüfen, um BOM korrekt zu behandeln
-        encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
-        file_encoding = None
-        
-        for encoding in encodings:
-            try:
-                with open(input_file, 'r', encoding=encoding) as test_file:
-                    test_file.read()
-                    file_encoding = encoding
-                    break
-            except UnicodeDecodeError:
-                continue
-        
-        if file_encoding is None:
-            print("❌ Fehler: Konnte die Kodierung der Datei nicht erkennen.")
+        if is_same_file(input_file, output_file):
+            print("❌ Fehler: Eingabe- und Ausgabedatei dürfen nicht identisch sein.")
             return False
         
-        print(f"📄 Verwende Kodierung: {file_encoding}")
-        
-        # Lese die CSV-Datei
-        with open(input_file, 'r', encoding=file_encoding, newline='') as infile:
-            # Erkenne den Delimiter
-            sample = infile.read(1024)
-            infile.seek(0)
-            delimiter = ';' if ';' in sample else ','
+        # Die Datei wird nur einmal geöffnet: Kodierung und Delimiter werden über
+        # denselben Datei-Handle erkannt, danach wird sie geparst
+        with open(input_file, 'rb', buffering=IO_BUFFER_SIZE) as raw_infile:
+            # Erkenne die Kodierung (die ganze Datei wird blockweise geprüft)
+            # utf-8-sig zuerst prüfen, um BOM korrekt zu behandeln
+            encodings = ['utf-8-sig', 'utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
+            file_encoding = encoding_from_file(raw_infile, encodings)
             
-            print(f"📊 Erkannter Delimiter: '{delimiter}'")
+            if file_encoding is None:
+                print("❌ Fehler: Konnte die Kodierung der Datei nicht erkennen.")
+                return False
+            
+            log(f"📄 Verwende Kodierung: {file_encoding}")
+            
+            # Erkenne den Delimiter aus einer Stichprobe vom Dateianfang
+            raw_infile.seek(0)
+            delimiter = delimiter_from_sample(raw_infile.read(SAMPLE_SIZE), (';', ','))
+            
+            log(f"📊 Erkannter Delimiter: '{delimiter}'")
             
-            # Lese alle Zeilen
+            # Lese die CSV-Datei über denselben Datei-Handle
+            raw_infile.seek(0)
+            infile = io.TextIOWrapper(raw_infile, encoding=file_encoding, newline='')
+            
+            # Lese vorerst nur die ersten Zeilen (Header und mögliche Übersetzungen)
             csv_reader = csv.reader(infile, delimiter=delimiter)
-            rows = list(csv_reader)
+            head_rows = list(itertools.islice(csv_reader, 3))
             
-            if len(rows) < 1:
+            if len(head_rows) < 1:
                 print("❌ Fehler: Die CSV-Datei ist leer.")
                 return False
             
             # Analysiere Header
-            original_header = rows[0]
+            original_header = head_rows[0]
             column_mapping, standard_columns, missing_columns = get_column_mapping(original_header)
             
-            print(f"\n📋 Spaltenanalyse:")
-            print(f"   Gefundene Spalten: {len(column_mapping)}")
-            print(f"   Erwartete Spalten: {len(standard_columns)}")
+            log(f"\n📋 Spaltenanalyse:")
+            log(f"   Gefundene Spalten: {len(column_mapping)}")
+            log(f"   Erwartete Spalten: {len(standard_columns)}")
             
             if missing_columns:
-                print(f"\n⚠️  Fehlende Spalten erkannt:")
+                log(f"\n⚠️  Fehlende Spalten erkannt:")
                 for col in missing_columns:
-                    print(f"   - {col}")
+                    log(f"   - {col}")
                 
                 # Prüfe ob die kritischen Spalten fehlen
                 critical_missing = []
@@ -148,78 +213,103 @@ def process_csv(input_file, output_file=None):
                     critical_missing.append("Hosted Datei ID")
                 
                 if critical_missing:
-                    print(f"\n✅ Folgende Spalten werden ergänzt: {', '.join(critical_missing)}")
+                    log(f"\n✅ Folgende Spalten werden ergänzt: {', '.join(critical_missing)}")
             else:
-                print("   ✅ Alle erwarteten Spalten vorhanden")
-            
-            # Erstelle neue Zeilen mit korrekter Spaltenstruktur
-            processed_rows = []
+                log("   ✅ Alle erwarteten Spalten vorhanden")
             
             # Prüfe ob es mehrere Header-Zeilen gibt (Zeile 2 und 3 sind Übersetzungen)
-            has_translated_headers = len(rows) >= 3
+            has_translated_headers = len(head_rows) >= 3
             header_rows_count = 1
             
             if has_translated_headers:
                 # Prüfe ob Zeile 2 und 3 auch Header sind (keine URLs enthalten)
-                row2_looks_like_header = len(rows) > 1 and not any('http' in str(val).lower() for val in rows[1])
-                row3_looks_like_header = len(rows) > 2 and not any('http' in str(val).lower() for val in rows[2])
+                row2_looks_like_header = len(head_rows) > 1 and not any(_HTTP_RE.search(val) for val in head_rows[1])
+                row3_looks_like_header = len(head_rows) > 2 and not any(_HTTP_RE.search(val) for val in head_rows[2])
                 
                 if row2_looks_like_header and row3_looks_like_header:
                     header_rows_count = 3
-                    print(f"\n📋 Erkannte Header-Zeilen: 3 (mit Übersetzungen)")
+                    log(f"\n📋 Erkannte Header-Zeilen: 3 (mit Übersetzungen)")
+            
+            # Standard-Spaltenname je Original-Spalte (None = unbekannt), einmal ermittelt
+            # und für alle folgenden Index-Berechnungen wiederverwendet
+            header_standard = [column_mapping.get(orig_col) for orig_col in original_header]
+            
+            # Position jeder gefundenen Standard-Spalte in der Original-Kopfzeile (erste Übereinstimmung)
+            orig_idx_by_std = {}
+            for orig_col_idx, standard_col in enumerate(header_standard):
+                if standard_col is not None:
+                    orig_idx_by_std.setdefault(standard_col, orig_col_idx)
             
             # Erstelle Header-Zeilen
+            header_rows = []
             for header_idx in range(header_rows_count):
                 header_row = []
-                for col_idx, col_variations in enumerate(EXPECTED_COLUMNS):
-                    # Suche ob diese Spalte in der Original-Header existiert
-                    found = False
-                    for orig_col_idx, orig_header in enumerate(original_header):
-                        orig_header_clean = orig_header.strip().lstrip('\ufeff')
-                        if orig_header_clean in col_variations:
-                            # Spalte existiert - verwende den Wert aus der entsprechenden Zeile
-                            if header_idx < len(rows) and orig_col_idx < len(rows[header_idx]):
-                                header_row.append(rows[header_idx][orig_col_idx])
-                            else:
-                                # Fallback: verwende die entsprechende Sprachversion
-                                if header_idx < len(col_variations):
-                                    header_row.append(col_variations[header_idx])
-                                else:
-                                    header_row.append(col_variations[0])
-                            found = True
-                            break
-                    
-                    if not found:
+                for col_variations in EXPECTED_COLUMNS:
+                    orig_col_idx = orig_idx_by_std.get(col_variations[0])
+                    if orig_col_idx is not None and header_idx < len(head_rows) and orig_col_idx < len(head_rows[header_idx]):
+                        # Spalte existiert - verwende den Wert aus der entsprechenden Zeile
+                        header_row.append(head_rows[header_idx][orig_col_idx])
+                    elif header_idx < len(col_variations):
                         # Spalte fehlt - ergänze mit der entsprechenden Sprachversion
-                        if header_idx < len(col_variations):
-                            header_row.append(col_variations[header_idx])
-                        else:
-                            # Fallback auf erste Version wenn keine Übersetzung vorhanden
-                            header_row.append(col_variations[0])
+                        header_row.append(col_variations[header_idx])
+                    else:
+                        # Fallback auf erste Version wenn keine Übersetzung vorhanden
+                        header_row.append(col_variations[0])
                 
-                processed_rows.append(header_row)
+                header_rows.append(header_row)
             
             # Variablen für AcCode-Ersetzung
             nautos_code = None
+            new_prefix = None
             ac_code_replacements = 0
             
-            # Verarbeite Datenzeilen (überspringe Header-Zeilen)
-            for row_num, row in enumerate(rows[header_rows_count:], start=header_rows_count + 1):
-                new_row = []
+            # Position der ID-Spalte im Original (wird während der Verarbeitung auf Inhalte geprüft)
+            orig_id_index = next((i for i, standard_col in enumerate(header_standard) if standard_col == "ID"), None)
+            id_had_content = False
+            
+            # Index-Permutation: für jede Standard-Spalte alle Indizes in der Originalzeile (leer = fehlt)
+            # Bei mehrfach vorhandenen Spalten gewinnt wie bisher der letzte vorhandene Wert
+            src_indices = [[] for _ in standard_columns]
+            for orig_col_idx, standard_col in enumerate(header_standard):
+                if standard_col is not None:
+                    src_indices[STANDARD_COLUMN_INDEX[standard_col]].append(orig_col_idx)
+            ac_out_index = STANDARD_COLUMN_INDEX["AcCode*"]
+            
+            # Spezialbehandlung für ID-Spalte: Inhalt wird immer gelöscht
+            src_indices[STANDARD_COLUMN_INDEX["ID"]] = []
+            build_row = build_row_function(src_indices)
+            
+            # Schreibe die optimierte CSV-Datei Zeile für Zeile
+            with open(output_file, 'wb', buffering=IO_BUFFER_SIZE) as outfile:
+                counting_writer = CountingWriter(outfile, file_encoding)
+                csv_writer = csv.writer(counting_writer, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
+                csv_writer.writerows(header_rows)
+                row_count = len(header_rows)
                 
-                # Erstelle ein Dictionary der aktuellen Zeile
-                row_data = {}
-                for i, value in enumerate(row):
-                    if i < len(original_header):
-                        orig_col = original_header[i]
-                        if orig_col in column_mapping:
-                            standard_col = column_mapping[orig_col]
-                            row_data[standard_col] = value
+                # Merke die Byte-Positionen der Chunk-Grenzen für ein eventuelles Splitting
+                # (erster Eintrag = Ende der Header-Zeilen). Ein Chunk endet nach ROWS_PER_CHUNK
+                # Zeilen oder vorher, wenn er mit Header sonst größer als MAX_FILE_SIZE_KB würde.
+                chunk_offsets = [counting_writer.bytes_written]
+                chunk_row_counts = []
+                max_chunk_data_bytes = MAX_FILE_SIZE_KB * 1024 - chunk_offsets[0]
+                chunk_rows = 0
+                prev_pos = chunk_offsets[0]
                 
-                # AcCode-Verarbeitung
-                if "AcCode*" in row_data:
-                    ac_code = row_data["AcCode*"]
-                    if ac_code and ac_code.startswith("CS"):
+                # Verarbeite Datenzeilen (bereits gelesene Zeilen nach dem Header, dann den Rest der Datei)
+                data_rows = itertools.chain(head_rows[header_rows_count:], csv_reader)
+                for row_num, row in enumerate(data_rows, start=header_rows_count + 1):
+                    # Prüfe ob ID-Spalte Inhalte hatte
+                    if not id_had_content and orig_id_index is not None and orig_id_index < len(row) and row[orig_id_index].strip():
+                        id_had_content = True
+                    
+                    # Fülle neue Zeile in der richtigen Reihenfolge (fehlende Spalten und ID leer)
+                    new_row = build_row(row)
+                    
+                    # AcCode-Verarbeitung
+                    ac_code = new_row[ac_out_index]
+                    # Häufigster Fall (kein "CS"-Code) kostet nur den startswith-Aufruf;
+                    # nach abgelehnter Eingabe (False) wird nichts mehr geprüft
+                    if ac_code.startswith("CS") and nautos_code is not False:
                         if nautos_code is None:
                             print(f"\n⚠️  AcCode mit 'CS' gefunden: {ac_code}")
                             # Versuche Input zu bekommen, Fallback falls kein Terminal
@@ -228,61 +318,47 @@ def process_csv(input_file, output_file=None):
                                     code_input = input("   Bitte geben Sie den 3-stelligen Nautos-Code ein: ").strip()
                                     if len(code_input) == 3:
                                         nautos_code = code_input
+                                        # Neuer Präfix: CS + 3-stellig + N (einmalig erstellt)
+                                        new_prefix = f"CS{nautos_code}N"
                                         break
                                     print("   ❌ Bitte genau 3 Zeichen eingeben.")
                             except (EOFError, OSError):
                                 print("   ❌ Interaktive Eingabe nicht möglich. Überspringe Ersetzung.")
                                 nautos_code = False # Markiere als fehlgeschlagen/übersprungen
 
-                        if nautos_code:
-                            # Erstelle neuen Code: CS + 3-stellig + N + Rest ab 6. Zeichen
-                            new_prefix = f"CS{nautos_code}N"
+                        if new_prefix is not None:
+                            # Erstelle neuen Code: Präfix + Rest ab 6. Zeichen
                             if len(ac_code) >= 6:
-                                new_ac_code = new_prefix + ac_code[6:]
-                                row_data["AcCode*"] = new_ac_code
+                                new_row[ac_out_index] = new_prefix + ac_code[6:]
                                 ac_code_replacements += 1
-
-                # Fülle neue Zeile in der richtigen Reihenfolge
-                for standard_col in standard_columns:
-                    if standard_col in row_data:
-                        # Spezialbehandlung für ID-Spalte: Inhalt löschen
-                        if standard_col == "ID":
-                            new_row.append("")  # ID-Inhalt entfernen
-                        else:
-                            new_row.append(row_data[standard_col])
-                    else:
-                        # Fehlende Spalte mit leerem Wert ergänzen
-                        new_row.append("")
+                    
+                    csv_writer.writerow(new_row)
+                    row_count += 1
+                    
+                    pos = counting_writer.bytes_written
+                    if chunk_rows and pos - chunk_offsets[-1] > max_chunk_data_bytes:
+                        # Zeile passt nicht mehr in den aktuellen Chunk -> Grenze vor dieser Zeile
+                        chunk_offsets.append(prev_pos)
+                        chunk_row_counts.append(chunk_rows)
+                        chunk_rows = 0
+                    chunk_rows += 1
+                    if chunk_rows == ROWS_PER_CHUNK:
+                        chunk_offsets.append(pos)
+                        chunk_row_counts.append(chunk_rows)
+                        chunk_rows = 0
+                    prev_pos = pos
                 
-                processed_rows.append(new_row)
-            
-            # Prüfe ob ID-Spalte Inhalte hatte
-            id_had_content = False
-            if "ID" in column_mapping.values():
-                id_index = standard_columns.index("ID")
-                for row in rows[1:]:
-                    orig_id_index = None
-                    for i, header in enumerate(original_header):
-                        if header in column_mapping and column_mapping[header] == "ID":
-                            orig_id_index = i
-                            break
-                    if orig_id_index is not None and orig_id_index < len(row):
-                        if row[orig_id_index].strip():
-                            id_had_content = True
-                            break
+                if chunk_rows:
+                    chunk_offsets.append(prev_pos)
+                    chunk_row_counts.append(chunk_rows)
             
             if id_had_content:
-                print("\n🗑️  ID-Spalte: Inhalte wurden entfernt")
-            
-            # Schreibe die optimierte CSV-Datei
-            with open(output_file, 'w', encoding=file_encoding, newline='') as outfile:
-                csv_writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
-                csv_writer.writerows(processed_rows)
+                log("\n🗑️  ID-Spalte: Inhalte wurden entfernt")
             
-            print(f"\n✅ Erfolgreich optimiert!")
-            print(f"   Eingabe:  {input_file}")
-            print(f"   Ausgabe:  {output_file}")
-            print(f"   Zeilen:   {len(processed_rows)}")
+            log(f"\n✅ Erfolgreich optimiert!")
+            log(f"   Eingabe:  {input_file}")
+            log(f"   Ausgabe:  {output_file}")
+            log(f"   Zeilen:   {row_count}")
             
             # Zusammenfassung der Änderungen
             changes_made = []
@@ -294,59 +370,52 @@ def process_csv(input_file, output_file=None):
                 changes_made.append(f"AcCode angepasst ({ac_code_replacements}x)")
             
             if changes_made:
-                print(f"\n📝 Durchgeführte Änderungen:")
+                log(f"\n📝 Durchgeführte Änderungen:")
                 for change in changes_made:
-                    print(f"   ✓ {change}")
+                    log(f"   ✓ {change}")
             else:
-                print(f"\n📝 Keine Änderungen notwendig (Datei war bereits optimal)")
+                log(f"\n📝 Keine Änderungen notwendig (Datei war bereits optimal)")
             
             # Prüfe Dateigröße und biete Splitting an
             file_size_kb = os.path.getsize(output_file) / 1024
-            print(f"\n📊 Dateigröße: {file_size_kb:.1f} KB")
+            log(f"\n📊 Dateigröße: {file_size_kb:.1f} KB")
             
             if file_size_kb > MAX_FILE_SIZE_KB:
                 print(f"\n⚠️  Die Datei ist größer als {MAX_FILE_SIZE_KB} KB!")
                 
                 # Frage ob gesplittet werden soll
                 try:
-                    split_response = input(f"   Soll die Datei in Chunks à {ROWS_PER_CHUNK} Zeilen aufgeteilt werden? [J/n]: ").strip().lower()
+                    split_response = input(f"   Soll die Datei in Chunks (max. {ROWS_PER_CHUNK} Zeilen / {MAX_FILE_SIZE_KB} KB) aufgeteilt werden? [J/n]: ").strip().lower()
                     should_split = split_response in ['', 'j', 'ja', 'y', 'yes']
                 except (EOFError, OSError):
                     print("   ❌ Interaktive Eingabe nicht möglich. Überspringe Splitting.")
                     should_split = False
                 
                 if should_split:
-                    # Extrahiere Header-Zeilen (die ersten header_rows_count Zeilen)
-                    header_rows = processed_rows[:header_rows_count]
-                    data_rows = processed_rows[header_rows_count:]
-                    
-                    # Berechne Anzahl der Chunks
-                    total_data_rows = len(data_rows)
-                    num_chunks = (total_data_rows + ROWS_PER_CHUNK - 1) // ROWS_PER_CHUNK
+                    # Anzahl der Chunks steht durch die gemerkten Grenzen bereits fest
+                    num_chunks = len(chunk_row_counts)
                     
-                    print(f"\n📦 Splitting in {num_chunks} Dateien...")
+                    log(f"\n📦 Splitting in {num_chunks} Dateien...")
                     
                     base_name, extension = os.path.splitext(output_file)
                     chunk_files = []
                     
-                    for chunk_idx in range(num_chunks):
-                        start_row = chunk_idx * ROWS_PER_CHUNK
-                        end_row = min(start_row + ROWS_PER_CHUNK, total_data_rows)
-                        
-                        chunk_data = data_rows[start_row:end_row]
-                        chunk_rows = header_rows + chunk_data
-                        
-                        chunk_file = f"{base_name}_part{chunk_idx + 1}{extension}"
-                        chunk_files.append(chunk_file)
-                        
-                        with open(chunk_file, 'w', encoding=file_encoding, newline='') as outfile:
-                            csv_writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
-                            csv_writer.writerows(chunk_rows)
+                    # Kopiere die beim Schreiben gemerkten Byte-Bereiche (kein erneutes CSV-Parsen)
+                    with open(output_file, 'rb') as optimized_file:
+                        header_bytes = optimized_file.read(chunk_offsets[0])
                         
-                        chunk_size_kb = os.path.getsize(chunk_file) / 1024
-                        print(f"   ✓ {chunk_file} ({len(chunk_data)} Datenzeilen, {chunk_size_kb:.1f} KB)")
+                        for chunk_idx in range(num_chunks):
+                            chunk_file = f"{base_name}_part{chunk_idx + 1}{extension}"
+                            chunk_files.append(chunk_file)
+                            
+                            with open(chunk_file, 'wb') as outfile:
+                                outfile.write(header_bytes)
+                                outfile.write(optimized_file.read(chunk_offsets[chunk_idx + 1] - chunk_offsets[chunk_idx]))
+                            
+                            chunk_size_kb = os.path.getsize(chunk_file) / 1024
+                            log(f"   ✓ {chunk_file} ({chunk_row_counts[chunk_idx]} Datenzeilen, {chunk_size_kb:.1f} KB)")
                     
-                    print(f"\n✅ {num_chunks} Chunk-Dateien erstellt (jeweils mit {header_rows_count}-zeiligem Header)")
+                    log(f"\n✅ {num_chunks} Chunk-Dateien erstellt (jeweils mit {header_rows_count}-zeiligem Header)")
             
             return True
             
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Encoding- und Delimiter-Erkennung für CSV-Dateien (und gemeinsame Prüfungen der Ein-/Ausgabedateien)
+Gemeinsam genutzt von csvRepair_NoLineBreaks.py, dokumentimportoptimizer.py und debug_header.py
+"""
+
+import codecs
+import os
+import re
+from functools import lru_cache
+
+# Standard-Kandidaten (meist UTF-8 oder Latin-1 für deutsche Dateien)
+DEFAULT_ENCODINGS = ('utf-8', 'latin-1', 'iso-8859-1', 'cp1252')
+
+# Delimiter-Kandidaten
+DEFAULT_DELIMITERS = (';', ',', '\t', '|')
+
+# Größe der Stichprobe vom Dateianfang
+SAMPLE_SIZE = 65536
+
+def is_same_file(input_file, output_file):
+    """
+    Prüft, ob die Ausgabedatei dieselbe Datei wie die Eingabedatei ist
+    
+    Die Skripte schreiben die Ausgabe, während sie die Eingabe noch lesen - beim
+    Öffnen der Ausgabe würde dieselbe Datei vor dem Lesen geleert.
+    """
+    return os.path.exists(output_file) and os.path.samefile(input_file, output_file)
+
+def read_sample(input_file, max_bytes=SAMPLE_SIZE):
+    """Liest eine Stichprobe vom Dateianfang (für die Delimiter-Erkennung)"""
+    with open(input_file, 'rb') as f:
+        return f.read(max_bytes)
+
+def detect_encoding(input_file, encodings=DEFAULT_ENCODINGS, block_size=SAMPLE_SIZE):
+    """
+    Erkennt die Kodierung einer CSV-Datei (siehe encoding_from_file)
+    
+    Das Ergebnis wird pro Datei zwischengespeichert, solange sich die Datei nicht ändert.
+    
+    Args:
+        input_file: Pfad zur CSV-Datei
+        encodings: Zu prüfende Kodierungen in der gewünschten Reihenfolge
+        block_size: Größe der blockweise gelesenen Abschnitte
+    
+    Returns:
+        str: Erste Kodierung, mit der sich die ganze Datei dekodieren lässt (oder None)
+    """
+    return _detect_encoding_cached(os.path.abspath(input_file), os.path.getmtime(input_file),
+                                   tuple(encodings), block_size)
+
+@lru_cache(maxsize=128)
+def _detect_encoding_cached(path, mtime, encodings, block_size):
+    """Eigentliche Erkennung; mtime ist Teil des Cache-Schlüssels"""
+    with open(path, 'rb') as f:
+        return encoding_from_file(f, encodings, block_size)
+
+def encoding_from_file(raw_file, encodings=DEFAULT_ENCODINGS, block_size=SAMPLE_SIZE):
+    """
+    Bestimmt die Kodierung einer im Binärmodus geöffneten Datei
+    
+    Jeder Kandidat wird mit einem inkrementellen Decoder blockweise über die ganze
+    Datei geprüft. Der Speicherbedarf bleibt konstant, und ein Umlaut weit hinten
+    in einer sonst reinen ASCII-Datei führt trotzdem zur richtigen Kodierung.
+    Die Dateiposition ist danach unbestimmt.
+    
+    Args:
+        raw_file: Binär geöffnete Datei (muss seek unterstützen)
+        encodings: Zu prüfende Kodierungen in der gewünschten Reihenfolge
+        block_size: Größe der blockweise gelesenen Abschnitte
+    
+    Returns:
+        str: Erste Kodierung, mit der sich die ganze Datei dekodieren lässt (oder None)
+    """
+    raw_file.seek(0)
+    first_block = raw_file.read(block_size)
+    
+    # Mit BOM wird utf-8-sig (falls gewünscht) zuerst geprüft
+    if 'utf-8-sig' in encodings and first_block.startswith(codecs.BOM_UTF8):
+        encodings = ['utf-8-sig'] + [e for e in encodings if e != 'utf-8-sig']
+    
+    for encoding in encodings:
+        # Latin-1 kann jede Bytefolge dekodieren - Lesen nicht nötig
+        if codecs.lookup(encoding).name == 'iso8859-1':
+            return encoding
+        
+        decoder = codecs.getincrementaldecoder(encoding)()
+        raw_file.seek(len(first_block))
+        block = first_block
+        try:
+            while block:
+                decoder.decode(block)
+                block = raw_file.read(block_size)
+            decoder.decode(b'', final=True)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    
+    return None
+
+def detect_delimiter(input_file, delimiters=DEFAULT_DELIMITERS, sample_size=SAMPLE_SIZE):
+    """
+    Erkennt den Delimiter anhand der ersten Zeilen der Datei (siehe delimiter_from_sample)
+    
+    Args:
+        input_file: Pfad zur CSV-Datei
+        delimiters: Kandidaten in der gewünschten Reihenfolge (bei Gleichstand gewinnt der erste)
+        sample_size: Anzahl der auszuwertenden Bytes
+    
+    Returns:
+        str: Erkannter Delimiter, ',' wenn keiner vorkommt
+    """
+    return delimiter_from_sample(read_sample(input_file, sample_size), delimiters, sample_size)
+
+def delimiter_from_sample(sample, delimiters=DEFAULT_DELIMITERS, sample_size=SAMPLE_SIZE):
+    """
+    Erkennt den Delimiter aus Bytes vom Dateianfang
+    
+    Gezählt wird nur außerhalb von Feldern in Anführungszeichen, damit Kommas in
+    Beschreibungen ("Bohrer, Fräser") oder Dezimalkommas nicht mitzählen. Gewählt wird
+    der erste Kandidat, der in jeder Zeile gleich oft vorkommt, sonst der erste, der
+    in jeder Zeile vorkommt, sonst der insgesamt häufigste.
+    
+    Returns:
+        str: Erkannter Delimiter, ',' wenn keiner vorkommt
+    """
+    sample = sample[:sample_size]
+    truncated = len(sample) == sample_size
+    
+    # Felder in Anführungszeichen entfernen (sie können auch Zeilenumbrüche enthalten).
+    # Ein Feld beginnt nur am Zeilenanfang oder nach einem Kandidaten - ein " mitten
+    # im Feld (z.B. Zollangabe 12") ist normaler Inhalt.
+    boundary = re.escape(''.join(delimiters).encode('ascii'))
+    field_start = rb'(?<![^' + boundary + rb'\r\n])"'
+    text = re.sub(field_start + rb'(?:[^"]|"")*"', b'', sample)
+    
+    # Ein am Stichprobenende abgeschnittenes Feld wird samt Rest verworfen
+    open_quote = re.search(field_start, text)
+    if open_quote:
+        text = text[:open_quote.start()]
+        truncated = True
+    
+    lines = text.splitlines()
+    if len(lines) > 1 and truncated:
+        # Letzte Zeile ist möglicherweise unvollständig
+        lines.pop()
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return ','
+    
+    counts = {d: [line.count(d.encode('ascii')) for line in lines] for d in delimiters}
+    
+    for d in delimiters:
+        if counts[d][0] and len(set(counts[d])) == 1:
+            return d
+    for d in delimiters:
+        if all(counts[d]):
+            return d
+    
+    totals = {d: sum(c) for d, c in counts.items()}
+    if not any(totals.values()):
+        return ','
+    return max(totals, key=totals.get)
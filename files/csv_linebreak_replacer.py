@@ -6,9 +6,62 @@ Ersetzt Zeilenumbrüche innerhalb von CSV-Feldern durch " <br> "
 """
 
 import csv
+import re
 import sys
 import os
 
+# Zeilenenden auf Byte-Ebene: Windows (\r\n), Mac (\r), Unix/Linux (\n)
+_LINE_END_RE = re.compile(rb'\r\n|\r|\n')
+
+# Blockgröße beim Prüfen der Kodierung und beim Kopieren (die Datei wird nie komplett eingelesen)
+READ_BLOCK_SIZE = 1 << 20
+
+def copy_unquoted_csv(input_file, output_file):
+    """
+    Schneller Weg ohne csv-Modul für Dateien ohne Anführungszeichen
+    
+    Ohne Anführungszeichen kann kein Feld einen Zeilenumbruch enthalten. Das Ergebnis
+    von csv.reader/csv.writer entspricht dann der Eingabe mit einheitlichen Zeilenenden
+    (\r\n, auch nach der letzten Zeile), die direkt auf Byte-Ebene erzeugt werden.
+    Die Datei wird blockweise kopiert, der Speicherbedarf bleibt konstant. Taucht ein
+    Anführungszeichen auf, wird abgebrochen; die Ausgabedatei wird dann vom
+    CSV-Weg neu geschrieben.
+    
+    Returns:
+        int: Anzahl der Zeilen, oder None wenn die Datei Anführungszeichen enthält (oder leer ist)
+    """
+    if os.path.getsize(input_file) == 0:
+        return None
+    
+    row_count = 0
+    carry = b''
+    line_closed = False
+    with open(input_file, 'rb') as raw_file, open(output_file, 'wb') as outfile:
+        while True:
+            block = raw_file.read(READ_BLOCK_SIZE)
+            if not block:
+                break
+            if b'"' in block:
+                return None
+            block = carry + block
+            
+            # Ein \r am Blockende könnte zu einem \r\n im nächsten Block gehören
+            carry = b''
+            if block.endswith(b'\r'):
+                block, carry = block[:-1], b'\r'
+            
+            block, count = _LINE_END_RE.subn(b'\r\n', block)
+            outfile.write(block)
+            row_count += count
+            line_closed = block.endswith(b'\r\n')
+        
+        # Letzte Zeile abschließen (übrig gebliebenes \r oder fehlendes Zeilenende)
+        if carry or not line_closed:
+            outfile.write(b'\r\n')
+            row_count += 1
+    
+    return row_count
+
 def process_csv(input_file, output_file=None):
     """
     Liest eine CSV-Datei und ersetzt Zeilenumbrüche innerhalb von Feldern durch " <br> "
@@ -24,6 +77,11 @@ def process_csv(input_file, output_file=None):
         output_file = f"{base_name}_processed{extension}"
     
     try:
+        # Die Ausgabe wird geschrieben, während die Eingabe noch gelesen wird
+        if os.path.exists(output_file) and os.path.samefile(input_file, output_file):
+            print("Fehler: Eingabe- und Ausgabedatei dürfen nicht identisch sein.")
+            return False
+        
         # Erkenne die Kodierung der Datei (meist UTF-8 oder Latin-1 für deutsche Dateien)
         encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
         file_encoding = None
@@ -31,7 +89,9 @@ def process_csv(input_file, output_file=None):
         for encoding in encodings:
             try:
                 with open(input_file, 'r', encoding=encoding) as test_file:
-                    test_file.read()
+                    # Blockweise dekodieren statt die ganze Datei als String zu halten
+                    while test_file.read(READ_BLOCK_SIZE):
+                        pass
                     file_encoding = encoding
                     break
             except UnicodeDecodeError:
@@ -43,10 +103,7 @@ def process_csv(input_file, output_file=None):
         
         print(f"Verwende Kodierung: {file_encoding}")
         
-        # Liste für die verarbeiteten Zeilen
-        processed_rows = []
-        
-        # Lese die CSV-Datei
+        # Lese die CSV-Datei und schreibe jede Zeile sofort (keine Zwischenliste)
         with open(input_file, 'r', encoding=file_encoding, newline='') as infile:
             # Erkenne den Delimiter (normalerweise ; oder ,)
             sample = infile.read(1024)
@@ -55,29 +112,34 @@ def process_csv(input_file, output_file=None):
             
             print(f"Erkannter Delimiter: '{delimiter}'")
             
-            # CSV-Reader mit dem erkannten Delimiter
+            # Ohne Anführungszeichen gibt es keine mehrzeiligen Felder -> kein CSV-Parsen nötig
+            row_count = copy_unquoted_csv(input_file, output_file)
+            if row_count is not None:
+                print(f"Verarbeitet: {row_count} Zeilen")
+                print(f"Erfolgreich gespeichert als: {output_file}")
+                return True
+            
+            # CSV-Reader und -Writer mit dem erkannten Delimiter
             csv_reader = csv.reader(infile, delimiter=delimiter)
             
-            # Verarbeite jede Zeile
-            for row_num, row in enumerate(csv_reader, 1):
-                # Ersetze Zeilenumbrüche in jedem Feld
-                processed_row = []
-                for field in row:
-                    # Ersetze alle Arten von Zeilenumbrüchen
-                    processed_field = field.replace('\r\n', ' <br> ')  # Windows
-                    processed_field = processed_field.replace('\n', ' <br> ')  # Unix/Linux
-                    processed_field = processed_field.replace('\r', ' <br> ')  # Mac
-                    processed_row.append(processed_field)
+            with open(output_file, 'w', encoding=file_encoding, newline='') as outfile:
+                csv_writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
                 
-                processed_rows.append(processed_row)
+                # Verarbeite jede Zeile
+                for row_num, row in enumerate(csv_reader, 1):
+                    # Ersetze Zeilenumbrüche in jedem Feld
+                    processed_row = []
+                    for field in row:
+                        # Ersetze alle Arten von Zeilenumbrüchen
+                        processed_field = field.replace('\r\n', ' <br> ')  # Windows
+                        processed_field = processed_field.replace('\n', ' <br> ')  # Unix/Linux
+                        processed_field = processed_field.replace('\r', ' <br> ')  # Mac
+                        processed_row.append(processed_field)
+                    
+                    csv_writer.writerow(processed_row)
             
             print(f"Verarbeitet: {row_num} Zeilen")
         
-        # Schreibe die verarbeitete CSV-Datei
-        with open(output_file, 'w', encoding=file_encoding, newline='') as outfile:
-            csv_writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
-            csv_writer.writerows(processed_rows)
-        
         print(f"Erfolgreich gespeichert als: {output_file}")
         return True
         
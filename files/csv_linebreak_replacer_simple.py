@@ -5,8 +5,22 @@ Einfacher CSV Zeilenumbruch-Ersetzer
 """
 
 import csv
+import os
+import re
 import sys
 
+# Alle Arten von Zeilenumbrüchen: Windows (\r\n), Mac (\r), Unix/Linux (\n)
+_LB_RE = re.compile(r'\r\n?|\n')
+
+# Schreibpuffer für die Ausgabedatei
+IO_BUFFER_SIZE = 1 << 20
+
+def _quote(field, delimiter):
+    """Quotet ein Feld wie csv.QUOTE_MINIMAL (enthält nach dem Ersetzen keine Zeilenumbrüche mehr)"""
+    if delimiter in field or '"' in field:
+        return '"' + field.replace('"', '""') + '"'
+    return field
+
 def replace_linebreaks_in_csv(input_file, output_file):
     """
     Ersetzt Zeilenumbrüche in CSV-Feldern durch <br> Tags
@@ -14,37 +28,46 @@ def replace_linebreaks_in_csv(input_file, output_file):
     # Versuche verschiedene Encodings
     for encoding in ['utf-8', 'latin-1', 'cp1252']:
         try:
+            # Die Ausgabe wird geschrieben, während die Eingabe noch gelesen wird
+            if os.path.exists(output_file) and os.path.samefile(input_file, output_file):
+                print("Fehler: Eingabe- und Ausgabedatei dürfen nicht identisch sein")
+                return False
+            
             with open(input_file, 'r', encoding=encoding, newline='') as infile:
                 # Erkenne Delimiter
                 sample = infile.read(1024)
                 infile.seek(0)
                 delimiter = ';' if ';' in sample else ','
                 
-                # Lese alle Zeilen
+                # Lese, ersetze und schreibe Zeile für Zeile
                 reader = csv.reader(infile, delimiter=delimiter)
-                rows = []
-                
-                for row in reader:
-                    # Ersetze Zeilenumbrüche in jedem Feld
-                    processed_row = [
-                        field.replace('\r\n', ' <br> ')
-                             .replace('\n', ' <br> ')
-                             .replace('\r', ' <br> ')
-                        for field in row
-                    ]
-                    rows.append(processed_row)
+                row_count = 0
                 
-                # Schreibe Ausgabedatei
-                with open(output_file, 'w', encoding=encoding, newline='') as outfile:
-                    writer = csv.writer(outfile, delimiter=delimiter, quoting=csv.QUOTE_MINIMAL)
-                    writer.writerows(rows)
+                # Direktes Schreiben statt csv.writer: ohne Zeilenumbrüche muss nur noch
+                # bei Delimiter oder Anführungszeichen gequotet werden
+                with open(output_file, 'w', encoding=encoding, newline='', buffering=IO_BUFFER_SIZE) as outfile:
+                    write = outfile.write
+                    
+                    for row in reader:
+                        # Ersetze Zeilenumbrüche in jedem Feld (Regex nur wenn nötig)
+                        processed_row = [
+                            _LB_RE.sub(' <br> ', field) if '\r' in field or '\n' in field else field
+                            for field in row
+                        ]
+                        if processed_row == ['']:
+                            # Wie csv.writer: ein einzelnes leeres Feld wird als "" geschrieben
+                            write('""\r\n')
+                        else:
+                            write(delimiter.join([_quote(field, delimiter) for field in processed_row]))
+                            write('\r\n')
+                        row_count += 1
                 
                 print(f"✓ Datei erfolgreich verarbeitet")
                 print(f"  Eingabe: {input_file}")
                 print(f"  Ausgabe: {output_file}")
                 print(f"  Encoding: {encoding}")
                 print(f"  Delimiter: '{delimiter}'")
-                print(f"  Zeilen: {len(rows)}")
+                print(f"  Zeilen: {row_count}")
                 return True
                 
         except UnicodeDecodeError:
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Tests für csvRepair_NoLineBreaks.py
+Ausführen mit: python -m unittest discover -s tests -t .
+"""
+
+import contextlib
+import csv
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import csvRepair_NoLineBreaks as repair
+from tests.test_encoding_utils import latin1_file_with_late_umlaut, semicolon_file_with_commas
+
+
+def run_quiet(function, *args, **kwargs):
+    """Führt eine Verarbeitungsfunktion aus und gibt (Ergebnis, Ausgabe) zurück"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = function(*args, **kwargs)
+    return result, output.getvalue()
+
+def read_rows(path, encoding='utf-8', delimiter=';'):
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        return list(csv.reader(f, delimiter=delimiter))
+
+
+class ProcessCsvTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+    
+    def test_umlaut_after_sample_is_kept(self):
+        input_file = latin1_file_with_late_umlaut(self.tmp_dir)
+        output_file = self.path('out.csv')
+        
+        result, log = run_quiet(repair.process_csv, input_file, output_file)
+        
+        self.assertTrue(result, log)
+        self.assertIn('Verwende Kodierung: latin-1', log)
+        with open(input_file, 'rb') as f_in, open(output_file, 'rb') as f_out:
+            self.assertEqual(f_out.read(), f_in.read())
+    
+    def test_semicolon_delimiter_with_comma_heavy_fields(self):
+        input_file = semicolon_file_with_commas(self.tmp_dir)
+        output_file = self.path('out.csv')
+        
+        result, log = run_quiet(repair.process_csv, input_file, output_file)
+        
+        self.assertTrue(result, log)
+        self.assertIn("Erkannter Delimiter: ';'", log)
+        self.assertIn('Ersetzte Strichpunkte in Spalten: 0', log)
+        self.assertEqual(read_rows(output_file), read_rows(input_file))
+    
+    def test_same_input_and_output_is_rejected(self):
+        input_file = semicolon_file_with_commas(self.tmp_dir)
+        with open(input_file, 'rb') as f:
+            original = f.read()
+        
+        result, log = run_quiet(repair.process_csv, input_file, input_file)
+        
+        self.assertFalse(result)
+        self.assertIn('nicht identisch', log)
+        with open(input_file, 'rb') as f:
+            self.assertEqual(f.read(), original)
+    
+    def test_whitespace_class_matches_python_s(self):
+        import re
+        import sys
+        whitespace = re.compile(f'[{repair._WHITESPACE}]')
+        for code in range(sys.maxunicode + 1):
+            char = chr(code)
+            self.assertEqual(bool(whitespace.match(char)), bool(re.match(r'\s', char)), hex(code))
+
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+FAST_PATH_CASES = {
+    'multiline': b'A;B;C\r\n1;"erste\r\nzweite";x\r\n2;"a\nb\n";"c;d"\r\n3;" <br> ";z\r\n',
+    'bom': b'\xef\xbb\xbfA;B\r\n007;"x\ry"\r\n',
+    'blank_line': b'A;B\r\n1;"x\r\ny"\r\n\r\n2;z',
+    'leading_blank_line': b'\r\nA\r\nB\r\n',
+    'empty': b'',
+    'bom_only': b'\xef\xbb\xbf',
+    'short_row': b'A;B;C\r\n1;2\r\n3;4;5\r\n',
+    'empty_fields': b'A;B\r\n;\r\n1;\r\n',
+    'unicode_whitespace': 'A;B\r\n1;"Text\xa0<br>"\r\n2;"x\x85<br>\u3000"\r\n3;"y\x1c <br>\r\n"\r\n'.encode('utf-8'),
+}
+
+
+@unittest.skipIf(pandas is None, "pandas nicht installiert")
+class ProcessCsvPandasTest(unittest.TestCase):
+    """process_csv_pandas muss dieselbe Datei und dieselben Zähler liefern wie process_csv"""
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def assert_same_as_process_csv(self, name, data):
+        input_file = os.path.join(self.tmp_dir, f'{name}.csv')
+        with open(input_file, 'wb') as f:
+            f.write(data)
+        
+        outputs = []
+        for function in (repair.process_csv, repair.process_csv_pandas):
+            output_file = os.path.join(self.tmp_dir, f'{name}_{function.__name__}.csv')
+            result, log = run_quiet(function, input_file, output_file)
+            self.assertTrue(result, log)
+            with open(output_file, 'rb') as f:
+                output = f.read()
+            # Verglichen werden die Zähler; Erkennung und Hinweise erscheinen beim
+            # Rückfall auf process_csv doppelt, der Ausgabepfad unterscheidet sich
+            log_lines = [line for line in log.splitlines()
+                         if not line.startswith(('Verwende Kodierung', 'Erkannter Delimiter',
+                                                 'Hinweis:', 'Erfolgreich gespeichert'))]
+            outputs.append((output, log_lines))
+        
+        self.assertEqual(outputs[1], outputs[0], name)
+    
+    @unittest.skipIf(pyarrow is None, "pyarrow nicht installiert")
+    def test_matches_process_csv_with_pyarrow(self):
+        for name, data in FAST_PATH_CASES.items():
+            self.assert_same_as_process_csv(name, data)
+    
+    def test_matches_process_csv_without_pyarrow(self):
+        with mock.patch.dict('sys.modules', {'pyarrow.csv': None}):
+            for name, data in FAST_PATH_CASES.items():
+                self.assert_same_as_process_csv(name, data)
+
+
+if __name__ == '__main__':
+    unittest.main()
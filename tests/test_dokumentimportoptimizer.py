@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Tests für dokumentimportoptimizer.py
+Ausführen mit: python -m unittest discover -s tests -t .
+"""
+
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import dokumentimportoptimizer as optimizer
+from encoding_utils import SAMPLE_SIZE
+from tests.test_csvrepair import run_quiet
+
+
+def write_import_file(path, data_rows, encoding='utf-8'):
+    """Schreibt eine Importdatei mit allen Standard-Spalten und den angegebenen Datenzeilen"""
+    with open(path, 'w', encoding=encoding, newline='') as f:
+        writer = csv.writer(f, delimiter=';')
+        writer.writerow(optimizer.STANDARD_COLUMNS)
+        writer.writerows(data_rows)
+
+def data_row(number, description='Beschreibung'):
+    """Datenzeile in Standard-Spaltenreihenfolge"""
+    return [f'https://example.com/doc{number}.pdf', 'Link', '', description, 'de',
+            'Handbuch', str(number), '2024-01-01', 'AB12345', '', '', '']
+
+def read_rows(path, encoding='utf-8-sig'):
+    with open(path, 'r', encoding=encoding, newline='') as f:
+        return list(csv.reader(f, delimiter=';'))
+
+
+class CountingWriterTest(unittest.TestCase):
+    
+    def test_counts_encoded_bytes_including_bom(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'out.csv')
+            with open(path, 'wb') as f:
+                counting_writer = optimizer.CountingWriter(f, 'utf-8-sig')
+                writer = csv.writer(counting_writer, delimiter=';')
+                offsets = []
+                for row in (['ä', 'b'], ['Straße', 'x;y']):
+                    writer.writerow(row)
+                    offsets.append(counting_writer.bytes_written)
+            
+            with open(path, 'rb') as f:
+                data = f.read()
+        
+        self.assertEqual(offsets[-1], len(data))
+        self.assertEqual(data[:offsets[0]], '\ufeffä;b\r\n'.encode('utf-8'))
+
+
+class ProcessCsvTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def path(self, name):
+        return os.path.join(self.tmp_dir, name)
+    
+    def test_umlaut_after_sample_selects_latin1(self):
+        rows = []
+        while len(rows) * 80 <= SAMPLE_SIZE:
+            rows.append(data_row(len(rows)))
+        rows.append(data_row(len(rows), 'Müller Straße'))
+        input_file = self.path('late_umlaut.csv')
+        write_import_file(input_file, rows, encoding='latin-1')
+        output_file = self.path('out.csv')
+        
+        result, log = run_quiet(optimizer.process_csv, input_file, output_file)
+        
+        self.assertTrue(result, log)
+        self.assertIn('latin-1', log)
+        self.assertEqual(read_rows(output_file, 'latin-1')[-1][3], 'Müller Straße')
+    
+    def test_comma_heavy_descriptions_keep_semicolon_delimiter(self):
+        description = 'Bohrer, Fräser, Senker, Reibahlen, Gewindebohrer, Zentrierbohrer, Senker, Stufenbohrer: 1,50 / 2,75 / 3,10 / 4,20 / 5,90 / 6,40 / 7,80 EUR'
+        rows = [data_row(n, description) for n in range(20)]
+        input_file = self.path('commas.csv')
+        write_import_file(input_file, rows)
+        output_file = self.path('out.csv')
+        
+        result, log = run_quiet(optimizer.process_csv, input_file, output_file)
+        
+        self.assertTrue(result, log)
+        output_rows = read_rows(output_file)
+        self.assertEqual(output_rows[0], optimizer.STANDARD_COLUMNS)
+        self.assertEqual(output_rows[1][3], rows[0][3])
+    
+    def test_same_input_and_output_is_rejected(self):
+        input_file = self.path('in_place.csv')
+        write_import_file(input_file, [data_row(n) for n in range(20000)])
+        with open(input_file, 'rb') as f:
+            original = f.read()
+        
+        result, log = run_quiet(optimizer.process_csv, input_file, input_file)
+        
+        self.assertFalse(result)
+        self.assertIn('nicht identisch', log)
+        with open(input_file, 'rb') as f:
+            self.assertEqual(f.read(), original)
+    
+    def test_duplicate_column_keeps_last_present_value(self):
+        input_file = self.path('duplicate.csv')
+        with open(input_file, 'w', encoding='utf-8', newline='') as f:
+            f.write('DokumentUrl*;Dokumenttyp*;Sprache*;Document type*\r\n'
+                    'https://example.com/a.pdf;Handbuch;de\r\n'
+                    'https://example.com/b.pdf;Handbuch;en;Manual\r\n')
+        output_file = self.path('out.csv')
+        
+        result, log = run_quiet(optimizer.process_csv, input_file, output_file)
+        
+        self.assertTrue(result, log)
+        type_index = optimizer.STANDARD_COLUMN_INDEX['Dokumenttyp*']
+        output_rows = read_rows(output_file)
+        self.assertEqual(output_rows[1][type_index], 'Handbuch')
+        self.assertEqual(output_rows[2][type_index], 'Manual')
+
+    def test_split_chunks_respect_size_limit_and_reassemble(self):
+        # ~400 Bytes pro Zeile: 3800 Zeilen wären deutlich größer als MAX_FILE_SIZE_KB
+        rows = [data_row(n, 'Lange Beschreibung ' * 18) for n in range(5000)]
+        input_file = self.path('long_rows.csv')
+        write_import_file(input_file, rows)
+        output_file = self.path('out.csv')
+        
+        with mock.patch('builtins.input', return_value='j'):
+            result, log = run_quiet(optimizer.process_csv, input_file, output_file)
+        
+        self.assertTrue(result, log)
+        with open(output_file, 'rb') as f:
+            output = f.read()
+        header_end = output.index(b'\r\n') + 2
+        
+        parts = []
+        part_number = 1
+        while os.path.exists(self.path(f'out_part{part_number}.csv')):
+            with open(self.path(f'out_part{part_number}.csv'), 'rb') as f:
+                parts.append(f.read())
+            part_number += 1
+        
+        self.assertGreater(len(parts), 2)
+        for part in parts:
+            self.assertLessEqual(len(part), optimizer.MAX_FILE_SIZE_KB * 1024)
+            self.assertEqual(part[:header_end], output[:header_end])
+        self.assertEqual(output[:header_end] + b''.join(part[header_end:] for part in parts), output)
+
+
+if __name__ == '__main__':
+    unittest.main()
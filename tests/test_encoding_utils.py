@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Tests für die Encoding- und Delimiter-Erkennung
+Ausführen mit: python -m unittest discover -s tests -t .
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from encoding_utils import SAMPLE_SIZE, delimiter_from_sample, detect_encoding, encoding_from_file
+
+
+def latin1_file_with_late_umlaut(directory):
+    """Latin-1-Datei, deren erstes Nicht-ASCII-Byte hinter SAMPLE_SIZE liegt"""
+    path = os.path.join(directory, 'late_umlaut.csv')
+    lines = ['Name;Ort\r\n']
+    while sum(len(line) for line in lines) <= SAMPLE_SIZE:
+        lines.append('Mustermann;Berlin\r\n')
+    lines.append('Müller Straße;München\r\n')
+    with open(path, 'w', encoding='latin-1', newline='') as f:
+        f.write(''.join(lines))
+    return path
+
+def semicolon_file_with_commas(directory):
+    """Strichpunkt-Datei, deren Beschreibungen und Preise mehr Kommas als Strichpunkte enthalten"""
+    path = os.path.join(directory, 'commas.csv')
+    lines = ['Artikel;Beschreibung;Preis\r\n']
+    for number in range(30):
+        lines.append(f'{number};"Bohrer, Fräser, Senker, Reibahlen, Gewindebohrer";{number},50\r\n')
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(''.join(lines))
+    return path
+
+
+class DetectEncodingTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def write(self, name, data):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def test_umlaut_after_sample_selects_latin1(self):
+        path = latin1_file_with_late_umlaut(self.tmp_dir)
+        self.assertEqual(detect_encoding(path), 'latin-1')
+        self.assertEqual(detect_encoding(path, ['utf-8-sig', 'utf-8', 'latin-1']), 'latin-1')
+    
+    def test_utf8_multibyte_across_block_boundary(self):
+        path = self.write('utf8.csv', b'a' * (SAMPLE_SIZE - 1) + 'ä;ö\r\n'.encode('utf-8'))
+        self.assertEqual(detect_encoding(path), 'utf-8')
+    
+    def test_truncated_utf8_at_end_is_not_utf8(self):
+        path = self.write('truncated.csv', b'a;b\r\n' + 'ä'.encode('utf-8')[:1])
+        self.assertEqual(detect_encoding(path, ['utf-8', 'cp1252']), 'cp1252')
+    
+    def test_bom_prefers_utf8_sig(self):
+        path = self.write('bom.csv', b'\xef\xbb\xbfa;b\r\n')
+        self.assertEqual(detect_encoding(path, ['utf-8', 'utf-8-sig']), 'utf-8-sig')
+    
+    def test_encoding_from_file_on_open_handle(self):
+        path = latin1_file_with_late_umlaut(self.tmp_dir)
+        with open(path, 'rb') as f:
+            self.assertEqual(encoding_from_file(f, ['utf-8', 'cp1252']), 'cp1252')
+
+
+class DelimiterFromSampleTest(unittest.TestCase):
+    
+    def test_commas_inside_quotes_and_decimal_commas_are_ignored(self):
+        sample = b'a;b;c\r\n1;"Bohrer, Fr\xe4ser, Senker";1,50\r\n2;"x, y";2,75\r\n'
+        self.assertEqual(delimiter_from_sample(sample), ';')
+        self.assertEqual(delimiter_from_sample(sample, (';', ',')), ';')
+    
+    def test_semicolons_inside_quotes_are_ignored(self):
+        self.assertEqual(delimiter_from_sample(b'a,b\r\n"x;y;z",2\r\n"p;q",3\r\n'), ',')
+    
+    def test_multiline_quoted_field(self):
+        self.assertEqual(delimiter_from_sample(b'a;b\r\n1;"erste, Zeile\r\nzweite, Zeile"\r\n2;3\r\n'), ';')
+    
+    def test_quote_inside_unquoted_field(self):
+        self.assertEqual(delimiter_from_sample(b'Rohr;Groesse\r\n12" Rohr, lang;5\r\n'), ';')
+    
+    def test_tab(self):
+        self.assertEqual(delimiter_from_sample(b'a\tb\r\n1,5\t2\r\n'), '\t')
+    
+    def test_no_candidate(self):
+        self.assertEqual(delimiter_from_sample(b'nur eine Spalte\r\n'), ',')
+        self.assertEqual(delimiter_from_sample(b''), ',')
+    
+    def test_truncated_quoted_field_at_sample_end(self):
+        sample = b'a;b\r\n1;"abgeschnitten, , , ,'
+        self.assertEqual(delimiter_from_sample(sample, sample_size=len(sample)), ';')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Tests für die Scripts im Ordner files/
+Ausführen mit: python -m unittest discover -s tests -t .
+"""
+
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.test_csvrepair import run_quiet
+
+FILES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'files')
+
+
+def load_script(name):
+    """Lädt ein Script aus files/ als Modul (der Ordner ist kein Paket)"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(FILES_DIR, f'{name}.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+simple = load_script('csv_linebreak_replacer_simple')
+replacer = load_script('csv_linebreak_replacer')
+
+MULTILINE_CSV = b'A;B\r\n1;"erste\r\nzweite"\r\n2;"x\ny"\r\n'
+
+
+class ScriptTestCase(unittest.TestCase):
+    
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+    
+    def write(self, name, data):
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+class SimpleReplacerTest(ScriptTestCase):
+    
+    def test_replaces_linebreaks(self):
+        input_file = self.write('in.csv', MULTILINE_CSV)
+        output_file = os.path.join(self.tmp_dir, 'out.csv')
+        
+        result, log = run_quiet(simple.replace_linebreaks_in_csv, input_file, output_file)
+        
+        self.assertTrue(result, log)
+        self.assertEqual(self.read(output_file), b'A;B\r\n1;erste <br> zweite\r\n2;x <br> y\r\n')
+    
+    def test_same_input_and_output_is_rejected(self):
+        input_file = self.write('in.csv', MULTILINE_CSV)
+        
+        result, log = run_quiet(simple.replace_linebreaks_in_csv, input_file, input_file)
+        
+        self.assertFalse(result)
+        self.assertEqual(self.read(input_file), MULTILINE_CSV)
+    
+    def test_missing_input_reports_error(self):
+        output_file = self.write('out.csv', MULTILINE_CSV)
+        
+        result, log = run_quiet(simple.replace_linebreaks_in_csv, os.path.join(self.tmp_dir, 'missing.csv'), output_file)
+        
+        self.assertFalse(result)
+        self.assertIn('Fehler:', log)
+
+
+class ReplacerTest(ScriptTestCase):
+    
+    def process(self, data):
+        input_file = self.write('in.csv', data)
+        output_file = os.path.join(self.tmp_dir, 'out.csv')
+        result, log = run_quiet(replacer.process_csv, input_file, output_file)
+        self.assertTrue(result, log)
+        return self.read(output_file), log
+    
+    def test_unquoted_file_only_normalizes_line_ends(self):
+        # Blockgröße 4: \r\n liegt über einer Blockgrenze
+        with mock.patch.object(replacer, 'READ_BLOCK_SIZE', 4):
+            output, log = self.process(b'a;b\r\n\r\nc;d\ne\rf;g')
+        
+        self.assertEqual(output, b'a;b\r\n\r\nc;d\r\ne\r\nf;g\r\n')
+        self.assertIn('Verarbeitet: 5 Zeilen', log)
+    
+    def test_quote_after_first_block_falls_back_to_csv(self):
+        data = b'a;b\r\n' * 10 + MULTILINE_CSV
+        with mock.patch.object(replacer, 'READ_BLOCK_SIZE', 16):
+            output, log = self.process(data)
+        
+        self.assertEqual(output, b'a;b\r\n' * 10 + b'A;B\r\n1;erste <br> zweite\r\n2;x <br> y\r\n')
+    
+    def test_same_input_and_output_is_rejected(self):
+        for data in (MULTILINE_CSV, b'a;b\r\nc;d\r\n'):
+            input_file = self.write('in.csv', data)
+            
+            result, log = run_quiet(replacer.process_csv, input_file, input_file)
+            
+            self.assertFalse(result)
+            self.assertEqual(self.read(input_file), data)
+
+
+if __name__ == '__main__':
+    unittest.main()